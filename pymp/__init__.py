@@ -2,27 +2,145 @@
 # pylint: disable=invalid-name, bad-continuation, len-as-condition
 from __future__ import print_function
 
+import ctypes as _ctypes
 import functools as _functools
+import gc as _gc
+import io as _io
 import logging as _logging
 import multiprocessing as _multiprocessing
 import os as _os
+import pickle as _pickle
 import platform as _platform
+import random as _random
+import select as _select
 import sys as _sys
+import tempfile as _tempfile
 import time as _time
 
 import pymp.config as _config
 import pymp.shared as _shared
 
+try:
+    import fcntl as _fcntl
+except ImportError:  # pragma: no cover
+    # Not available on Windows, which is not supported anyway.
+    _fcntl = None
+
 _is_py2 = _sys.version[0] == "2"
 if _is_py2:
     import Queue as _Queue  # pylint: disable=import-error
+    from StringIO import StringIO as _StringIO  # pylint: disable=import-error
+
+    # Lazy range, so that the loop indices are never materialized.
+    _range = xrange  # pylint: disable=undefined-variable
 else:
     import queue as _Queue  # pylint: disable=import-error, E0102
 
+    _range = range
+    _StringIO = _io.StringIO
+
 
 _LOGGER = _logging.getLogger(__name__)
 
 
+def _cpu_socket(cpu):
+    """Get the socket of a CPU (0 if unknown)."""
+    try:
+        with _io.open(
+            "/sys/devices/system/cpu/cpu%d/topology/physical_package_id" % cpu,
+            encoding="ascii",
+        ) as topology_file:
+            return int(topology_file.read())
+    except (IOError, ValueError):
+        return 0
+
+
+def _bind_thread(thread_num):
+    """Bind the current process to the CPUs of a thread (see `config.bind`)."""
+    if _config.bind == "none" or not hasattr(_os, "sched_setaffinity"):
+        return
+    try:
+        cpus = sorted(_os.sched_getaffinity(0))
+        if _config.bind == "sockets":
+            sockets = {}
+            for cpu in cpus:
+                sockets.setdefault(_cpu_socket(cpu), []).append(cpu)
+            places = [sockets[socket] for socket in sorted(sockets)]
+        else:
+            places = [[cpu] for cpu in cpus]
+        _os.sched_setaffinity(0, places[thread_num % len(places)])
+    except OSError as err:
+        _LOGGER.warning("Could not bind thread %d to CPUs: %s.", thread_num, err)
+
+
+def _wait_for_children(pids):
+    """
+    Wait for all child processes to finish and reap them.
+
+    On Linux >= 5.3, the children are waited for simultaneously by polling
+    their process file descriptors. Otherwise, they are waited for one by
+    one.
+    """
+    pidfds = {}
+    try:
+        for pid in pids:
+            pidfds[_os.pidfd_open(pid)] = pid
+    except (AttributeError, OSError):
+        for pidfd in pidfds:
+            _os.close(pidfd)
+        for pid in pids:
+            _LOGGER.debug("Waiting for process %d...", pid)
+            _os.waitpid(pid, 0)
+        return
+    _LOGGER.debug("Waiting for processes %s...", str(pids))
+    poller = _select.poll()
+    for pidfd in pidfds:
+        poller.register(pidfd, _select.POLLIN)
+    while pidfds:
+        for pidfd, _ in poller.poll():
+            poller.unregister(pidfd)
+            _os.waitpid(pidfds.pop(pidfd), 0)
+            _os.close(pidfd)
+
+
+def _send_report(pipe, report):  # pragma: no cover
+    """
+    Send a pickled report of a fork to the master.
+
+    Reports of less than PIPE_BUF bytes are written atomically. Returns
+    whether the report was sent, which fails instead of blocking if the pipe
+    is full.
+    """
+    write_fd = pipe[1]
+    flags = _fcntl.fcntl(write_fd, _fcntl.F_GETFL)
+    _fcntl.fcntl(write_fd, _fcntl.F_SETFL, flags | _os.O_NONBLOCK)
+    try:
+        _os.write(write_fd, report)
+    except OSError:
+        return False
+    return True
+
+
+def _receive_reports(pipe):
+    """Read all reports sent through a pipe and close it."""
+    read_fd, write_fd = pipe
+    _os.close(write_fd)
+    reports = b""
+    # Processes forked from within the region may still hold the write
+    # end, so only read what is available instead of waiting for EOF.
+    while _select.select([read_fd], [], [], 0)[0]:
+        chunk = _os.read(read_fd, _select.PIPE_BUF)
+        if not chunk:
+            break
+        reports += chunk
+    _os.close(read_fd)
+    report_stream = _io.BytesIO(reports)
+    received = []
+    while report_stream.tell() < len(reports):
+        received.append(_pickle.load(report_stream))
+    return received
+
+
 # pylint: disable=too-few-public-methods, too-many-instance-attributes
 class Parallel(object):
 
@@ -30,9 +148,12 @@ class Parallel(object):
 
     _level = 0
     _global_master = None
+    # Output buffer of the innermost region with buffered output in this
+    # process.
+    _print_buffer = None
 
     def __init__(
-        self, num_threads=None, if_=True
+        self, num_threads=None, if_=True, buffered_print=True
     ):  # pylint: disable=redefined-outer-name
         if _platform.system().startswith("Windows") or _platform.system().startswith(
             "CYGWIN"
@@ -52,14 +173,22 @@ class Parallel(object):
         self._lock = None
         if Parallel._global_master is None:
             Parallel._global_master = _os.getpid()
+        # Static schedule management.
+        self._static_bounds = {}
         # Dynamic schedule management.
-        self._dynamic_queue = _shared.queue()
+        self._deques = None
         self._iter_queue = None
         self._thread_loop_ids = None
-        self._queuelock = _shared.lock()
+        self._pool_loop_reached = None
+        self._queuelock = None
         # Exception management.
-        self._exception_queue = _shared.queue()
-        self._exception_lock = _shared.lock()
+        self._exception_pipe = None
+        # Reduction variables.
+        self._reductions = []
+        # Output management.
+        self._buffered_print = buffered_print
+        self._print_pipe = None
+        self._outer_print_buffer = None
         # Allows for self-checks.
         self._entered = False
         self._disposed = False
@@ -70,7 +199,6 @@ class Parallel(object):
         )
         # pylint: disable=global-statement
         assert len(self._pids) == 0, "A `Parallel` object may only be used once!"
-        self._lock = _shared.lock()
         # pylint: disable=protected-access
         if self._num_threads is None:
             assert (
@@ -88,69 +216,151 @@ class Parallel(object):
         if not _config.nested:
             assert Parallel._level == 0, "No nested parallel contexts allowed!"
         Parallel._level += 1
-        self._iter_queue = _shared.queue(maxsize=self._num_threads - 1)
-        # pylint: disable=protected-access
-        with _shared._LOCK:
-            # Make sure that max threads is not exceeded.
-            if _config.thread_limit is not None:
-                # pylint: disable=protected-access
-                num_active = _shared._NUM_PROCS.value
-                self._num_threads = min(
-                    self._num_threads, _config.thread_limit - num_active + 1
-                )
-            _shared._NUM_PROCS.value += self._num_threads - 1
-        self._thread_loop_ids = _shared.list([-1] * self._num_threads)
-        for thread_num in range(1, self._num_threads):
-            pid = _os.fork()
-            if pid == 0:  # pragma: no cover
-                # Forked process.
-                self._is_fork = True
-                self._thread_num = thread_num
-                break
-            else:
-                # pylint: disable=protected-access
-                self._pids.append(pid)
+        if self._num_threads > 1:
+            # Only a forking region changes the process count and shares state
+            # between its threads, which must all exist before forking.
+            # pylint: disable=protected-access
+            with _shared._LOCK:
+                # Make sure that max threads is not exceeded.
+                if _config.thread_limit is not None:
+                    # pylint: disable=protected-access
+                    num_active = _shared._NUM_PROCS.value
+                    self._num_threads = min(
+                        self._num_threads, _config.thread_limit - num_active + 1
+                    )
+                _shared._NUM_PROCS.value += self._num_threads - 1
+            self._lock = _shared.lock()
+            self._queuelock = _shared.lock()
+            # A plain queue is inherited by the forks and needs no manager.
+            self._iter_queue = _multiprocessing.Queue(maxsize=self._num_threads - 1)
+            self._thread_loop_ids = _multiprocessing.RawArray(
+                "i", [-1] * self._num_threads
+            )
+            self._pool_loop_reached = _multiprocessing.RawValue("i", -1)
+            self._deques = _WorkDeques(self._num_threads)
+            self._exception_pipe = _os.pipe()
+        for reduction in self._reductions:
+            reduction._allocate(self._num_threads)
+        if self._buffered_print and self._num_threads > 1:
+            self._print_pipe = _os.pipe()
+        # Move all objects to the permanent generation while forking, so that
+        # the garbage collector of the forks does not write to (and thereby
+        # copy) the pages of every object it inherited.
+        freeze = self._num_threads > 1 and hasattr(_gc, "freeze")
+        was_frozen = False
+        if freeze:
+            was_frozen = _gc.get_freeze_count() > 0
+            _gc.freeze()
+        try:
+            for thread_num in range(1, self._num_threads):
+                pid = _os.fork()
+                if pid == 0:  # pragma: no cover
+                    # Forked process.
+                    self._is_fork = True
+                    self._thread_num = thread_num
+                    _bind_thread(thread_num)
+                    break
+                else:
+                    # pylint: disable=protected-access
+                    self._pids.append(pid)
+        finally:
+            # Unfreeze in the master even if forking failed.
+            if freeze and not was_frozen and not self._is_fork:
+                _gc.unfreeze()
         if not self._is_fork:
             _LOGGER.debug("Forked to processes: %s.", str(self._pids))
+        if self._print_pipe is not None or not self._buffered_print:
+            # Unbuffered regions print directly, even in a buffered region.
+            self._outer_print_buffer = Parallel._print_buffer
+            Parallel._print_buffer = _StringIO() if self._buffered_print else None
         self._entered = True
         return self
 
     def __exit__(self, exc_t, exc_val, exc_tb):
         _LOGGER.debug("Leaving parallel region (%d)...", _os.getpid())
-        if exc_t is not None:
-            with self._exception_lock:
-                self._exception_queue.put((exc_t, exc_val, self._thread_num))
         if self._is_fork:  # pragma: no cover
-            _LOGGER.debug("Process %d done. Shutting down.", _os.getpid())
-            _os._exit(1)  # pylint: disable=protected-access
-        for pid in self._pids:
-            _LOGGER.debug("Waiting for process %d...", pid)
-            _os.waitpid(pid, 0)
-        # pylint: disable=protected-access
-        with _shared._LOCK:
-            _shared._NUM_PROCS.value -= len(self._pids)
+            try:
+                if exc_t is not None:
+                    self._report_exception(exc_t, exc_val)
+                self._flush_print_buffer()
+                _LOGGER.debug("Process %d done. Shutting down.", _os.getpid())
+            finally:
+                # A fork must never leave the region.
+                _os._exit(1)  # pylint: disable=protected-access
+        _wait_for_children(self._pids)
+        if self._iter_queue is not None:
+            # Stop the feeder thread of the queue, so that later regions do not
+            # fork a multi-threaded process. Elements left over by failed
+            # threads are dropped.
+            try:
+                while True:
+                    self._iter_queue.get_nowait()
+            except _Queue.Empty:
+                pass
+            self._iter_queue.close()
+            self._iter_queue.join_thread()
+        exceptions = self._collect_exceptions()
+        if exc_t is not None:
+            exceptions.insert(0, (exc_t, exc_val, self._thread_num))
+        self._flush_print_buffer()
+        for reduction in self._reductions:
+            reduction._combine()
+        if self._pids:
+            # pylint: disable=protected-access
+            with _shared._LOCK:
+                _shared._NUM_PROCS.value -= len(self._pids)
         Parallel._level -= 1
         if _os.getpid() == Parallel._global_master:
-            # Reset the manager object.
-            # pylint: disable=protected-access, no-member
-            _shared._MANAGER = _multiprocessing.Manager()
+            # Reset the manager object if it was used.
+            # pylint: disable=protected-access
+            _shared._reset_manager()
         self._disposed = True
         # Take care of exceptions if necessary.
-        if self._enabled:
-            while not self._exception_queue.empty():
-                exc_t, exc_val, thread_num = self._exception_queue.get()
-                _LOGGER.critical(
-                    "An exception occured in thread %d: (%s, %s).",
-                    thread_num,
-                    exc_t,
-                    exc_val,
-                )
-                raise exc_t(exc_val)
-        else:
-            if not self._exception_queue.empty():
+        if exceptions:
+            if not self._enabled:
                 raise
+            exc_t, exc_val, thread_num = exceptions[0]
+            _LOGGER.critical(
+                "An exception occured in thread %d: (%s, %s).",
+                thread_num,
+                exc_t,
+                exc_val,
+            )
+            raise exc_t(exc_val)
         _LOGGER.debug("Parallel region left (%d).", _os.getpid())
 
+    def _report_exception(self, exc_t, exc_val):  # pragma: no cover
+        """
+        Send an exception of a fork to the master.
+
+        If the pipe is full, the exception is only logged.
+        """
+        try:
+            message = str(exc_val)[:512]
+        except Exception:  # pylint: disable=broad-except
+            try:
+                message = repr(exc_val)[:512]
+            except Exception:  # pylint: disable=broad-except
+                message = exc_t.__name__
+        try:
+            report = _pickle.dumps((exc_t, message, self._thread_num))
+        except (_pickle.PicklingError, AttributeError, TypeError):
+            message = "%s: %s" % (exc_t.__name__, message)
+            report = _pickle.dumps((Exception, message, self._thread_num))
+        if not _send_report(self._exception_pipe, report):
+            _LOGGER.critical(
+                "Could not report exception in thread %d: (%s, %s).",
+                self._thread_num,
+                exc_t,
+                message,
+            )
+
+    def _collect_exceptions(self):
+        """Read the exceptions sent by the forks."""
+        if self._exception_pipe is None:
+            return []
+        return _receive_reports(self._exception_pipe)
+
     def _assert_active(self):
         """Assert that the parallel region is active."""
         assert (
@@ -173,16 +383,93 @@ class Parallel(object):
     def lock(self):
         """Get a convenient, context specific lock."""
         self._assert_active()
+        if self._lock is None:
+            # Without forks, the lock can safely be created on first use.
+            self._lock = _shared.lock()
         return self._lock
 
+    def _flush_print_buffer(self):
+        """
+        Hand on the output buffered in this region.
+
+        Forks with output write it to a temporary file and send its name to
+        the master. The master collects the output of all threads in
+        `thread_num` order and prints it at once.
+        """
+        if not self._buffered_print:
+            Parallel._print_buffer = self._outer_print_buffer
+            return
+        if self._print_pipe is None:
+            return
+        output = Parallel._print_buffer.getvalue()
+        Parallel._print_buffer = self._outer_print_buffer
+        if self._is_fork:  # pragma: no cover
+            if output:
+                self._send_print_output(output)
+            return
+        for _, path in sorted(_receive_reports(self._print_pipe)):
+            with open(path, "rb") as print_file:
+                output += _pickle.load(print_file)
+            _os.remove(path)
+        if output:
+            Parallel.print(output, end="")
+
+    def _send_print_output(self, output):  # pragma: no cover
+        """Send the buffered output of a fork to the master."""
+        print_fd, path = _tempfile.mkstemp(prefix="pymp-")
+        with _os.fdopen(print_fd, "wb") as print_file:
+            _pickle.dump(output, print_file)
+        if not _send_report(self._print_pipe, _pickle.dumps((self._thread_num, path))):
+            _os.remove(path)
+            # Rather print out of order than not at all.
+            # pylint: disable=protected-access
+            with _shared._PRINT_LOCK:
+                _sys.stdout.write(output)
+                _sys.stdout.flush()
+
     @classmethod
     def print(cls, *args, **kwargs):
-        """Print synchronized."""
+        """
+        Print synchronized.
+
+        In a region with buffered output, the output of every thread is
+        collected and printed in `thread_num` order when it is left.
+        """
+        if (
+            Parallel._print_buffer is not None
+            and kwargs.get("file", _sys.stdout) is _sys.stdout
+        ):
+            kwargs["file"] = Parallel._print_buffer
+            print(*args, **kwargs)
+            return
         # pylint: disable=protected-access
         with _shared._PRINT_LOCK:
             print(*args, **kwargs)
             _sys.stdout.flush()
 
+    def reduce(self, op, initial=0, dtype=None):
+        """
+        Create a reduction variable for this parallel region.
+
+        This corresponds to the OpenMP 'reduction' clause and must be called
+        before entering the region. Every thread starts with its own partial
+        result ``initial``, which should be the identity of the binary
+        function ``op`` (e.g. 0 for addition). Within the region, the
+        ``value`` of the returned variable is the partial result of the
+        current thread and can be updated without locking. After the region,
+        ``value`` holds all partial results combined with ``op``.
+
+        Numpy is required, ``dtype`` defaults to float64.
+        """
+        # pylint: disable=protected-access
+        assert _shared._NP_AVAILABLE, "To use reductions, numpy must be available!"
+        assert (
+            not self._entered
+        ), "Reduction variables must be created before entering the region!"
+        reduction = _Reduction(self, op, initial, dtype)
+        self._reductions.append(reduction)
+        return reduction
+
     def range(self, start, stop=None, step=1):
         """
         Get the correctly distributed parallel chunks.
@@ -192,19 +479,44 @@ class Parallel(object):
         self._assert_active()
         if stop is None:
             start, stop = 0, start
-        full_list = range(start, stop, step)
-        per_worker = len(full_list) // self._num_threads
-        rem = len(full_list) % self._num_threads
-        schedule = [
-            per_worker + 1 if thread_idx < rem else per_worker
-            for thread_idx in range(self._num_threads)
-        ]
-        # pylint: disable=undefined-variable
-        start_idx = _functools.reduce(
-            lambda x, y: x + y, schedule[: self.thread_num], 0
-        )
-        end_idx = start_idx + schedule[self._thread_num]
-        return full_list[start_idx:end_idx]
+        per_worker, rem = divmod(len(_range(start, stop, step)), self._num_threads)
+        start_idx = self._thread_num * per_worker + min(self._thread_num, rem)
+        end_idx = start_idx + per_worker + (1 if self._thread_num < rem else 0)
+        return _range(start + start_idx * step, start + end_idx * step, step)
+
+    def _enter_loop(self):
+        """
+        Get the id of the next loop of this thread (with `_queuelock` held).
+
+        Also returns whether this thread is the first one to reach it. The
+        furthest loop reached by any thread is kept up to date, so that it
+        can be read without locking.
+        """
+        self._thread_loop_ids[self._thread_num] += 1
+        loop_id = self._thread_loop_ids[self._thread_num]
+        first = self._pool_loop_reached.value < loop_id
+        if first:
+            self._pool_loop_reached.value = loop_id
+        return loop_id, first
+
+    def static_range(self, n):
+        """
+        Get this thread's chunk of ``range(n)``.
+
+        Like `range`, this corresponds to the OpenMP 'static' schedule, but
+        the chunk bounds of all threads are only computed once per ``n`` and
+        are reused by subsequent calls.
+        """
+        self._assert_active()
+        bounds = self._static_bounds.get(n)
+        if bounds is None:
+            per_worker, rem = divmod(n, self._num_threads)
+            bounds = tuple(
+                thread_idx * per_worker + min(thread_idx, rem)
+                for thread_idx in range(self._num_threads + 1)
+            )
+            self._static_bounds[n] = bounds
+        return _range(bounds[self._thread_num], bounds[self._thread_num + 1])
 
     def xrange(self, start, stop=None, step=1):
         """
@@ -215,17 +527,15 @@ class Parallel(object):
         self._assert_active()
         if stop is None:
             start, stop = 0, start
+        if self._num_threads == 1:
+            return iter(_range(start, stop, step))
         with self._queuelock:
-            pool_loop_reached = max(self._thread_loop_ids)
-            # Get this loop id.
-            self._thread_loop_ids[self._thread_num] += 1
-            loop_id = self._thread_loop_ids[self._thread_num]
-            if pool_loop_reached < loop_id:
-                # No thread reached this loop yet. Set up the queue.
-                for idx in range(start, stop, step):
-                    self._dynamic_queue.put(idx)
-            # Iterate.
-            return _QueueIterator(self._dynamic_queue, loop_id, self)
+            loop_id, first = self._enter_loop()
+            if first:
+                # No thread reached this loop yet. Set up the deques.
+                self._deques.fill(loop_id, len(_range(start, stop, step)))
+        # Iterate.
+        return _DequeIterator(self._deques, loop_id, self, start, step)
 
     def iterate(self, iterable, element_timeout=None):
         """
@@ -242,24 +552,172 @@ class Parallel(object):
         You can specify a timeout for the clients to adhere.
         """
         self._assert_active()
+        if self._num_threads == 1:
+            return iter(iterable)
         with self._queuelock:
-            # Get this loop id.
-            self._thread_loop_ids[self._thread_num] += 1
-            loop_id = self._thread_loop_ids[self._thread_num]
+            loop_id, _ = self._enter_loop()
             # Iterate.
             return _IterableQueueIterator(
                 self._iter_queue, loop_id, self, iterable, element_timeout
             )
 
 
-class _QueueIterator(object):
+class _Reduction(object):
+
+    """
+    A reduction variable of a parallel region.
+
+    The partial results are kept in a shared array with one row per thread,
+    padded to a cache line so that threads do not share one while updating
+    their partial results.
+    """
+
+    _CACHE_LINE_BYTES = 64
+
+    def __init__(self, pcontext, op, initial, dtype):
+        self._pcontext = pcontext
+        self._op = op
+        self._initial = initial
+        self._dtype = dtype
+        self._partials = None
+        self._value = initial
+
+    def _allocate(self, num_threads):
+        """Set up the partial results for ``num_threads`` threads."""
+        # pylint: disable=protected-access
+        itemsize = _shared._np.dtype(self._dtype).itemsize
+        padding = -(-self._CACHE_LINE_BYTES // itemsize)
+        self._partials = _shared.array((num_threads, padding), dtype=self._dtype)
+        self._partials[:, 0] = self._initial
+
+    def _combine(self):
+        """Combine the partial results after all threads are done."""
+        self._value = _functools.reduce(self._op, self._partials[:, 0].tolist())
+        self._partials = None
+
+    @property
+    def value(self):
+        """The partial result of this thread, or the result after the region."""
+        if self._partials is None:
+            return self._value
+        return self._partials[self._pcontext.thread_num, 0]
+
+    @value.setter
+    def value(self, value):
+        assert self._partials is not None, "The parallel region is not active!"
+        self._partials[self._pcontext.thread_num, 0] = value
+
+
+class _WorkDeques(object):
+
+    """
+    Per-worker deques of loop iterations for the dynamic schedule.
+
+    Every worker owns one deque, stored in shared memory as the triple
+    ``(loop_id, begin, end)`` of iteration positions. The owner takes
+    chunks of iterations from the front of its deque; a worker that runs
+    dry steals half of the remaining iterations from the back of another
+    worker's deque. Each deque is guarded by its own lock, so workers only
+    contend when stealing from the same victim.
+
+    A stolen range is invisible while it is moved to the thief's deque.
+    The pair ``(loop_id, unclaimed)`` therefore counts the iterations of
+    the current loop that are not yet taken by a worker; a worker only
+    leaves the loop (and may set up the next one) once it reaches zero.
+    """
+
+    def __init__(self, num_threads):
+        self._num_threads = num_threads
+        # Python 2 has no typecode for 64 bit integers.
+        self._state = _multiprocessing.RawArray(
+            _ctypes.c_int64, [-1, 0, 0] * num_threads
+        )
+        self._locks = [_shared.lock() for _ in range(num_threads)]
+        self._unclaimed = _multiprocessing.RawArray(_ctypes.c_int64, [-1, 0])
+        self._unclaimed_lock = _shared.lock()
+
+    def fill(self, loop_id, num_items):
+        """Statically distribute ``num_items`` iterations over the deques."""
+        with self._unclaimed_lock:
+            self._unclaimed[0] = loop_id
+            self._unclaimed[1] = num_items
+        per_worker, rem = divmod(num_items, self._num_threads)
+        begin = 0
+        for deque_idx in range(self._num_threads):
+            end = begin + per_worker + (1 if deque_idx < rem else 0)
+            with self._locks[deque_idx]:
+                self._state[3 * deque_idx] = loop_id
+                self._state[3 * deque_idx + 1] = begin
+                self._state[3 * deque_idx + 2] = end
+            begin = end
+
+    def claim(self, loop_id, num_items):
+        """Mark ``num_items`` iterations of a loop as taken by a worker."""
+        with self._unclaimed_lock:
+            if self._unclaimed[0] == loop_id:
+                self._unclaimed[1] -= num_items
+
+    def has_unclaimed(self, loop_id):
+        """Whether iterations of the loop are not yet taken by a worker."""
+        with self._unclaimed_lock:
+            return self._unclaimed[0] == loop_id and self._unclaimed[1] > 0
+
+    def push(self, deque_idx, loop_id, begin, end):
+        """Put a range of iterations into an empty deque of the same loop."""
+        offset = 3 * deque_idx
+        with self._locks[deque_idx]:
+            if (
+                self._state[offset] != loop_id
+                or self._state[offset + 1] < self._state[offset + 2]
+            ):
+                return False
+            self._state[offset + 1] = begin
+            self._state[offset + 2] = end
+            return True
+
+    def pop(self, deque_idx, loop_id):
+        """Take a chunk from the front of the owned deque (or None)."""
+        offset = 3 * deque_idx
+        with self._locks[deque_idx]:
+            begin = self._state[offset + 1]
+            end = self._state[offset + 2]
+            if self._state[offset] != loop_id or begin >= end:
+                return None
+            chunk_end = begin + max(1, (end - begin) // self._num_threads)
+            self._state[offset + 1] = chunk_end
+            self.claim(loop_id, chunk_end - begin)
+            return begin, chunk_end
+
+    def steal(self, deque_idx, loop_id):
+        """Take half of the iterations from the back of a victim's deque."""
+        offset = 3 * deque_idx
+        with self._locks[deque_idx]:
+            begin = self._state[offset + 1]
+            end = self._state[offset + 2]
+            if self._state[offset] != loop_id or begin >= end:
+                return None
+            split = end - (end - begin + 1) // 2
+            self._state[offset + 2] = split
+            return split, end
+
+
+class _DequeIterator(object):
 
     """Iterator to create the dynamic schedule."""
 
-    def __init__(self, queue, loop_id, pcontext):
-        self._queue = queue
+    def __init__(  # pylint: disable=too-many-arguments
+        self, deques, loop_id, pcontext, start, step
+    ):
+        self._deques = deques
         self._loop_id = loop_id
-        self._pcontext = pcontext
+        self._deque_idx = pcontext.thread_num
+        self._num_threads = pcontext.num_threads
+        self._victims_rng = _random.Random(_os.getpid())
+        self._start = start
+        self._step = step
+        # The chunk of iteration positions currently worked on.
+        self._pos = 0
+        self._end = 0
 
     # pylint: disable=non-iterator-returned
     def __iter__(self):
@@ -268,17 +726,42 @@ class _QueueIterator(object):
     def __next__(self):
         return self.next()
 
+    def _steal(self):
+        """Steal from the other deques, starting at a random one."""
+        first_victim = self._victims_rng.randrange(self._num_threads)
+        for victim_offset in range(self._num_threads):
+            victim = (first_victim + victim_offset) % self._num_threads
+            if victim == self._deque_idx:
+                continue
+            chunk = self._deques.steal(victim, self._loop_id)
+            if chunk is not None:
+                return chunk
+        return None
+
     def next(self):
         """Iterator implementation."""
-        # pylint: disable=protected-access
-        with self._pcontext._queuelock:
-            # Check that the pool still deals with this loop.
-            # pylint: disable=protected-access
-            pool_loop_reached = max(self._pcontext._thread_loop_ids)
-            if pool_loop_reached > self._loop_id or self._queue.empty():
-                raise StopIteration()
-            else:
-                return self._queue.get()
+        if self._pos >= self._end:
+            chunk = self._deques.pop(self._deque_idx, self._loop_id)
+            while chunk is None:
+                stolen = self._steal()
+                if stolen is None:
+                    if self._deques.has_unclaimed(self._loop_id):
+                        # Another worker is moving a stolen range; yield the
+                        # CPU to it before retrying.
+                        _time.sleep(0)
+                        continue
+                    raise StopIteration()
+                if self._deques.push(self._deque_idx, self._loop_id, *stolen):
+                    # Publish the stolen range so that others can steal from it.
+                    chunk = self._deques.pop(self._deque_idx, self._loop_id)
+                else:
+                    # The pool moved on to the next loop; finish the range here.
+                    self._deques.claim(self._loop_id, stolen[1] - stolen[0])
+                    chunk = stolen
+            self._pos, self._end = chunk
+        pos = self._pos
+        self._pos += 1
+        return self._start + pos * self._step
 
 
 class _IterableQueueIterator(object):
@@ -321,9 +804,8 @@ class _IterableQueueIterator(object):
                 # Consumer.
                 # Check that the pool still deals with this loop.
                 # pylint: disable=protected-access
-                with self._pcontext._queuelock:
-                    pool_loop_reached = max(self._pcontext._thread_loop_ids)
-                    master_reached = self._pcontext._thread_loop_ids[0]
+                pool_loop_reached = self._pcontext._pool_loop_reached.value
+                master_reached = self._pcontext._thread_loop_ids[0]
                 if pool_loop_reached > self._loop_id:
                     raise StopIteration()
                 elif master_reached < self._loop_id:
@@ -66,3 +66,18 @@ else:
         "The PYMP_THREAD_LIMIT/OMP_THREAD_LIMIT variable must be an intereger "
         "greater zero!"
     )
+
+# OpenMP has no equivalent of this setting, so only PYMP_BIND is read.
+_bind_env = _os.environ.get("PYMP_BIND")
+if _bind_env is None:
+    #: How to bind the forked threads to CPUs: 'none' (leave placement to the
+    #: operating system), 'cores' (one CPU per thread) or 'sockets' (all CPUs
+    #: of one socket per thread).
+    bind = "none"
+else:  # pragma: no cover
+    assert _bind_env.lower() in ["none", "cores", "sockets"], (
+        "The configuration for PYMP_BIND must be either "
+        "NONE, CORES or SOCKETS. Is %s.",
+        _bind_env,
+    )
+    bind = _bind_env.lower()
@@ -1,5 +1,6 @@
 """Contains shared datastructures."""
 # pylint: disable=no-member, unused-import, ungrouped-imports
+import mmap as _mmap
 import multiprocessing as _multiprocessing
 import warnings as _warnings
 import logging
@@ -14,6 +15,7 @@ except ImportError:  # pragma: no cover
     _NP_AVAILABLE = False
 
 _MANAGER = None
+_MANAGER_DIRTY = False
 _NUM_PROCS = _multiprocessing.Value("i", 1, lock=False)  # pylint: disable=no-member
 _LOCK = lock()
 _PRINT_LOCK = lock()
@@ -21,7 +23,8 @@ _LOGGER = logging.getLogger(__name__)
 
 
 def _get_manager():
-    global _MANAGER, _LOCK
+    global _MANAGER, _MANAGER_DIRTY, _LOCK
+    _MANAGER_DIRTY = True
     if _MANAGER is None:
         with _LOCK:
             if _MANAGER is None:
@@ -40,6 +43,14 @@ def _get_manager():
     return _MANAGER
 
 
+def _reset_manager():
+    """Drop the manager if it was used, so that a fresh one is started lazily."""
+    global _MANAGER, _MANAGER_DIRTY
+    if _MANAGER_DIRTY:
+        _MANAGER = None
+        _MANAGER_DIRTY = False
+
+
 def array(shape, dtype=None, autolock=False):
     """
     Factory method for shared memory arrays supporting all numpy dtypes.
@@ -51,12 +62,18 @@ def array(shape, dtype=None, autolock=False):
         dtype = _np.float64
     if not isinstance(dtype, _np.dtype):
         dtype = _np.dtype(dtype)
+    size = int(_np.prod(shape))
+    nbytes = size * dtype.itemsize
+    if not autolock:
+        # The memory is only shared with forks, so an anonymous shared mapping
+        # suffices. It holds no file descriptor and is zero-filled by the
+        # kernel on first access, so it is neither initialized nor touched here.
+        buf = _mmap.mmap(-1, max(nbytes, 1))
+        return _np.frombuffer(buf, dtype=dtype, count=size).reshape(shape)
     # Not bothering to translate the numpy dtypes to ctype types directly,
     # because they're only partially supported. Instead, create a byte ctypes
     # array of the right size and use a view of the appropriate datatype.
-    shared_arr = _multiprocessing.Array(
-        "b", int(_np.prod(shape) * dtype.itemsize), lock=autolock
-    )
+    shared_arr = _multiprocessing.Array("b", nbytes, lock=autolock)
     with _warnings.catch_warnings():
         # For more information on why this is necessary, see
         # https://www.reddit.com/r/Python/comments/j3qjb/parformatlabpool_replacement
@@ -2,6 +2,7 @@
 # pylint: disable=protected-access, invalid-name
 from __future__ import print_function
 import logging
+import os
 
 import unittest
 
@@ -98,6 +99,21 @@ class ParallelTest(unittest.TestCase):
                 tarr[i, 0] = 1.0
         self.assertEqual(np.sum(tarr), 5.0)
 
+    def test_static_range(self):
+        """Test the memoized static schedule."""
+        import pymp
+
+        pymp.config.nested = False
+        pymp.config.thread_limit = 4
+        tlist = pymp.shared.list()
+        with pymp.Parallel(3) as p:
+            for _ in range(2):
+                chunk = p.static_range(10)
+                self.assertEqual(list(chunk), list(p.range(10)))
+            tlist.extend(chunk)
+            tlist.extend(p.static_range(2))
+        self.assertEqual(sorted(tlist), sorted(list(range(10)) + [0, 1]))
+
     @unittest.skipIf(
         not pymp._shared._NP_AVAILABLE, "Skipping test because numpy is not available."
     )
@@ -119,6 +135,27 @@ class ParallelTest(unittest.TestCase):
                     tarr[0, 0] += 1.0
         self.assertEqual(tarr[0, 0], 1000.0)
 
+    @unittest.skipIf(
+        not pymp._shared._NP_AVAILABLE, "Skipping test because numpy is not available."
+    )
+    def test_reduce(self):
+        """Reduction test."""
+        import operator
+        import pymp
+
+        pymp.config.nested = False
+        pymp.config.thread_limit = 4
+        p = pymp.Parallel(2)
+        count = p.reduce(operator.add, 0.0)
+        maximum = p.reduce(max, -1, dtype="int64")
+        with p:
+            for iter_idx in p.range(1000):
+                count.value += 1.0
+                maximum.value = max(maximum.value, iter_idx)
+        self.assertEqual(count.value, 1000.0)
+        self.assertEqual(maximum.value, 999)
+        self.assertRaises(AssertionError, lambda: p.reduce(operator.add))
+
     def test_list(self):
         """Shared list test."""
         import pymp
@@ -155,6 +192,33 @@ class ParallelTest(unittest.TestCase):
                 tqueue.put(iter_idx)
         self.assertEqual(tqueue.qsize(), 400)
 
+    def test_no_manager(self):
+        """Test that regions without manager-backed objects start no manager."""
+        import multiprocessing.managers
+        import pymp
+
+        pymp.config.nested = False
+        pymp.config.thread_limit = 4
+        starts = []
+        start = multiprocessing.managers.BaseManager.start
+
+        def counting_start(manager, *args, **kwargs):
+            """Count the started managers."""
+            starts.append(manager)
+            return start(manager, *args, **kwargs)
+
+        multiprocessing.managers.BaseManager.start = counting_start
+        try:
+            for _ in range(5):
+                with pymp.Parallel(2) as p:
+                    for _ in p.range(10):
+                        pass
+                    for _ in p.xrange(10):
+                        pass
+        finally:
+            multiprocessing.managers.BaseManager.start = start
+        self.assertEqual(starts, [])
+
     def test_rlock(self):
         """Shared rlock test."""
         import pymp
@@ -203,6 +267,49 @@ class ParallelTest(unittest.TestCase):
                     tlist.append(idx)
         self.assertEqual(len(tlist), 10)
 
+    def test_xrange_coverage(self):
+        """Test that the dynamic schedule hands out every index once."""
+        import pymp
+
+        pymp.config.thread_limit = 4
+        pymp.config.nested = False
+        tlist = pymp.shared.list()
+        with pymp.Parallel(3) as p:
+            for idx in p.xrange(3, 200, 2):
+                tlist.append(idx)
+            for idx in p.xrange(7):
+                tlist.append(idx)
+        self.assertEqual(sorted(tlist), sorted(list(range(3, 200, 2)) + list(range(7))))
+
+    def test_deques_steal_in_flight(self):
+        """Test that a loop is not left while a stolen range is in flight."""
+        import pymp
+
+        deques = pymp._WorkDeques(3)
+        deques.fill(0, 30)
+        # Thread 2 runs dry and steals from thread 1, but did not publish the
+        # stolen range in its own deque yet.
+        while deques.pop(2, 0) is not None:
+            pass
+        stolen = deques.steal(1, 0)
+        self.assertEqual(stolen, (15, 20))
+        # Thread 0 finds its own deque and thread 2's empty, thread 1 drains
+        # its deque.
+        while deques.pop(0, 0) is not None:
+            pass
+        self.assertIsNone(deques.steal(2, 0))
+        while deques.pop(1, 0) is not None:
+            pass
+        self.assertIsNone(deques.steal(1, 0))
+        # Thread 0 must not consider the loop done.
+        self.assertTrue(deques.has_unclaimed(0))
+        self.assertTrue(deques.push(2, 0, *stolen))
+        self.assertEqual(deques.pop(2, 0), (15, 16))
+        self.assertTrue(deques.has_unclaimed(0))
+        while deques.pop(2, 0) is not None:
+            pass
+        self.assertFalse(deques.has_unclaimed(0))
+
     def test_exceptions(self):
         """Test raising behavior."""
         import pymp
@@ -218,6 +325,36 @@ class ParallelTest(unittest.TestCase):
 
         self.assertRaises(Exception, exc_context)
 
+    def test_exceptions_unprintable(self):
+        """Test exceptions that can not be converted to a string."""
+        import pymp
+
+        pymp.config.thread_limit = 4
+        pymp.config.nested = False
+
+        class Unprintable(Exception):
+            """An exception failing on conversion to string."""
+
+            def __str__(self):
+                raise RuntimeError()
+
+            def __repr__(self):
+                raise RuntimeError()
+
+        pids = pymp.shared.list()
+
+        def exc_context():
+            """Creates a context with an unprintable Exception in a subthread."""
+            try:
+                with pymp.Parallel(2) as p:
+                    if p.thread_num == 1:
+                        raise Unprintable()
+            finally:
+                pids.append(os.getpid())
+
+        self.assertRaises(Exception, exc_context)
+        self.assertEqual(list(pids), [os.getpid()])
+
     def test_print(self):  # pylint: disable=no-self-use
         """Test the print method."""
         import pymp
@@ -228,6 +365,73 @@ class ParallelTest(unittest.TestCase):
             with pymp.Parallel(2) as p:
                 p.print("Hi from thread {0}.".format(p.thread_num))
 
+    def test_print_buffered(self):
+        """Test that buffered output is printed in thread order."""
+        import sys
+        import tempfile
+        import pymp
+
+        pymp.config.thread_limit = 3
+        pymp.config.nested = False
+        stdout = sys.stdout
+        sys.stdout = tempfile.TemporaryFile(mode="w+")
+        try:
+            with pymp.Parallel(3) as p:
+                for idx in p.range(6):
+                    p.print(idx)
+            sys.stdout.seek(0)
+            output = sys.stdout.read()
+        finally:
+            sys.stdout.close()
+            sys.stdout = stdout
+        self.assertEqual(output, "0\n1\n2\n3\n4\n5\n")
+
+    def test_print_unbuffered_nested(self):
+        """Test that unbuffered output is not lost in a buffered region."""
+        import sys
+        import tempfile
+        import pymp
+
+        pymp.config.thread_limit = 4
+        pymp.config.nested = True
+        stdout = sys.stdout
+        # The forks must share the file to print to.
+        sys.stdout = tempfile.TemporaryFile(mode="w+")
+        try:
+            with pymp.Parallel(2):
+                with pymp.Parallel(2, buffered_print=False) as p:
+                    p.print("Hi.")
+            sys.stdout.seek(0)
+            output = sys.stdout.read()
+        finally:
+            sys.stdout.close()
+            sys.stdout = stdout
+        self.assertEqual(output, "Hi.\n" * 4)
+
+    @unittest.skipIf(
+        not hasattr(os, "sched_setaffinity"),
+        "Skipping test because CPU affinity is not supported.",
+    )
+    def test_bind(self):
+        """Test binding the forked threads to cores."""
+        import pymp
+
+        pymp.config.thread_limit = 3
+        pymp.config.nested = False
+        pymp.config.bind = "cores"
+        cpus = sorted(os.sched_getaffinity(0))
+        affinities = pymp.shared.list()
+        try:
+            with pymp.Parallel(3) as p:
+                affinities.append((p.thread_num, sorted(os.sched_getaffinity(0))))
+        finally:
+            pymp.config.bind = "none"
+        for thread_num, affinity in affinities:
+            if thread_num == 0:
+                self.assertEqual(affinity, cpus)
+            else:
+                self.assertEqual(affinity, [cpus[thread_num % len(cpus)]])
+
     def test_safety_check(self):
         """Test that the methods can only be used within their context."""
         import pymp
@@ -270,6 +474,40 @@ class ParallelTest(unittest.TestCase):
         self.assertRaises(ValueError, lambda: sa.reshape((4, 4)))
         sa.reshape((1, 3, 3))
 
+    @unittest.skipIf(
+        not pymp._shared._NP_AVAILABLE, "Skipping test because numpy is not available."
+    )
+    def test_array_dtypes(self):
+        """Test that shared arrays keep the full width of their dtype."""
+        import pymp
+
+        pymp.config.nested = False
+        pymp.config.thread_limit = 4
+        for dtype, value in [
+            ("int64", -(2**62) - 1),
+            ("uint64", 2**63 + 1),
+            ("int32", -(2**30) - 1),
+            ("float16", 0.5),
+        ]:
+            sa = pymp.shared.array((2,), dtype=dtype)
+            with pymp.Parallel(2) as p:
+                sa[p.thread_num] = value
+            self.assertEqual(sa.dtype, dtype)
+            self.assertEqual(sa.tolist(), [value, value])
+
+    @unittest.skipIf(
+        not pymp._shared._NP_AVAILABLE or not os.path.isdir("/proc/self/fd"),
+        "Skipping test because numpy or /proc/self/fd is not available.",
+    )
+    def test_array_no_fds(self):
+        """Test that shared arrays do not hold file descriptors."""
+        import pymp
+
+        num_fds = len(os.listdir("/proc/self/fd"))
+        arrays = [pymp.shared.array((8,)) for _ in range(100)]
+        self.assertEqual(len(os.listdir("/proc/self/fd")), num_fds)
+        self.assertEqual(len(arrays), 100)
+
     def test_iterable_two_threads(self):
         """Test if iterating over an iterable is working correctly."""
         import pymp
@@ -285,6 +523,17 @@ class ParallelTest(unittest.TestCase):
         for item in threads:
             self.assertEqual(item, 1)
 
+    def test_iterable_no_threads_left(self):
+        """Test that iterating leaves no threads behind."""
+        import threading
+        import pymp
+
+        num_threads = threading.active_count()
+        with pymp.Parallel(2) as p:
+            for _ in p.iterate(range(10)):
+                pass
+        self.assertEqual(threading.active_count(), num_threads)
+
     def test_iterable_one_thread(self):
         """Test if iterating over an iterable is working correctly."""
         import pymp